@@ -4,30 +4,30 @@ import idaapi
 import ida_netnode
 import time
 import json
+import math
+import random
+from array import array
+from bisect import bisect_left
+
+try:
+    import ida_hexrays
+except ImportError:
+    ida_hexrays = None
 
-QFontMetrics = None
 QPalette = None
 try:
-    from PyQt5.QtWidgets import QMainWindow, QApplication, QLabel, QWidget
-    from PyQt5.QtCore import QTimer, Qt, QEvent, QObject, QPoint
-    try:
-        from PyQt5.QtGui import QFontMetrics as _QFontMetrics
-        QFontMetrics = _QFontMetrics
-    except Exception:
-        QFontMetrics = None
+    from PyQt5.QtWidgets import QMainWindow, QApplication, QWidget, QToolTip
+    from PyQt5.QtCore import QTimer, Qt, QEvent, QObject, QPoint, QPointF, QRect, QSize
+    from PyQt5.QtGui import QPainter, QStaticText
     try:
         from PyQt5.QtGui import QPalette as _QPalette
         QPalette = _QPalette
     except Exception:
         QPalette = None
 except ModuleNotFoundError:
-    from PySide6.QtWidgets import QMainWindow, QApplication, QLabel, QWidget
-    from PySide6.QtCore import QTimer, Qt, QEvent, QObject, QPoint
-    try:
-        from PySide6.QtGui import QFontMetrics as _QFontMetrics
-        QFontMetrics = _QFontMetrics
-    except Exception:
-        QFontMetrics = None
+    from PySide6.QtWidgets import QMainWindow, QApplication, QWidget, QToolTip
+    from PySide6.QtCore import QTimer, Qt, QEvent, QObject, QPoint, QPointF, QRect, QSize
+    from PySide6.QtGui import QPainter, QStaticText
     try:
         from PySide6.QtGui import QPalette as _QPalette
         QPalette = _QPalette
@@ -37,6 +37,86 @@ except ModuleNotFoundError:
 NETNODE_NAME = "$ plugin time wasted"
 NETNODE_DB_TIME_KEY = 0
 NETNODE_DEBUG_TIME_KEY = 1
+NETNODE_ANALYSIS_INITIAL_KEY = 2
+NETNODE_ANALYSIS_QUEUE_KEY = 3
+NETNODE_ANALYSIS_DONE_KEY = 4
+NETNODE_DECOMPILE_COUNT_KEY = 5
+NETNODE_DECOMPILE_TOTAL_MS_KEY = 6
+NETNODE_DECOMPILE_MAX_MS_KEY = 7
+NETNODE_VIEW_TIME_KEY_BASE = 16
+NETNODE_DECOMPILE_HIST_KEY_BASE = 32
+
+CONFIG_POLL_INTERVAL_MS = 2000
+
+# Upper bounds of the decompile latency histogram buckets; one extra
+# overflow bucket holds everything slower than the last bound.
+DECOMPILE_LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+DEFAULT_CONFIG = {
+    "stop_re_count_when_debugging": False,
+    "global": True,
+    "global_debug": True,
+    "per_idb": True,
+    "per_idb_debug": True,
+    "per_session": True,
+    "per_session_debug": True,
+    "per_view": True,
+    "analysis_wait": True
+}
+
+VIEW_DISASM = 0
+VIEW_PSEUDOCODE = 1
+VIEW_HEX = 2
+VIEW_TYPES = 3
+VIEW_DEBUGGER = 4
+VIEW_OTHER = 5
+VIEW_NAMES = ("IDA View", "Pseudocode", "Hex View", "Structures/Types", "Debugger", "Other")
+
+# Widget types per view bucket; looked up by name since the set of BWN_*
+# constants differs between IDA versions.
+_VIEW_WIDGET_TYPES = (
+    (VIEW_DISASM, ("BWN_DISASM", "BWN_DISASM_ARROWS", "BWN_NAVBAND")),
+    (VIEW_PSEUDOCODE, ("BWN_PSEUDOCODE",)),
+    (VIEW_HEX, ("BWN_HEXVIEW",)),
+    (VIEW_TYPES, ("BWN_STRUCTS", "BWN_ENUMS", "BWN_LOCTYPS", "BWN_TILIST", "BWN_TILVIEW", "BWN_FRAME")),
+    (VIEW_DEBUGGER, ("BWN_CPUREGS", "BWN_STKVIEW", "BWN_MODULES", "BWN_THREADS", "BWN_BPTS",
+                     "BWN_CALL_STACK", "BWN_WATCH", "BWN_LOCALS", "BWN_TRACE", "BWN_ADDRWATCH")),
+)
+
+
+def _build_view_type_index():
+    index = {}
+    for view, names in _VIEW_WIDGET_TYPES:
+        for name in names:
+            wt = getattr(idaapi, name, None)
+            if wt is not None:
+                index.setdefault(wt, view)
+    return index
+
+
+_VIEW_TYPE_INDEX = _build_view_type_index()
+
+# Parsed config per path, keyed by (st_mtime_ns, st_size). Shared by every
+# plugin instance in the process so IDB reopens don't touch the file.
+_config_cache = {}
+
+
+def _config_file_key(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _idb_counter_keys(config):
+    # Netnode keys the time counters are written to under this config.
+    if not config["per_idb"]:
+        return []
+    keys = [NETNODE_DB_TIME_KEY, NETNODE_DEBUG_TIME_KEY]
+    if config["per_view"]:
+        keys.extend(NETNODE_VIEW_TIME_KEY_BASE + i for i in range(len(VIEW_NAMES)))
+    return keys
 
 def find_ida_main_window():
     for widget in QApplication.topLevelWidgets():
@@ -52,6 +132,32 @@ def format_elapsed(seconds):
     return f"{days:02}:{hours:02}:{minutes:02}:{secs:02}"
 
 
+def view_index_for_widget(widget):
+    if widget is None:
+        return VIEW_OTHER
+    try:
+        wt = idaapi.get_widget_type(widget)
+    except Exception:
+        return VIEW_OTHER
+    return _VIEW_TYPE_INDEX.get(wt, VIEW_OTHER)
+
+
+def decompile_bucket_index(ms):
+    for i, bound in enumerate(DECOMPILE_LATENCY_BUCKETS_MS):
+        if ms < bound:
+            return i
+    return len(DECOMPILE_LATENCY_BUCKETS_MS)
+
+
+def decompile_bucket_label(i):
+    bounds = DECOMPILE_LATENCY_BUCKETS_MS
+    if i == 0:
+        return f"<{bounds[0]} ms"
+    if i >= len(bounds):
+        return f">={bounds[-1]} ms"
+    return f"{bounds[i - 1]}-{bounds[i]} ms"
+
+
 def ida_version_at_least(major, minor):
     try:
         ver = idaapi.get_kernel_version()
@@ -86,10 +192,585 @@ def ida_version_at_least(major, minor):
 
     return False
 
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+class SessionHistory:
+    # Global session history, one row per session across four typed columns
+    # instead of a dict each (~32 MB for 1M sessions). Rows are
+    # (start, end, duration_sec, debug_duration_sec) tuples.
+    __slots__ = ("start", "end", "duration", "debug_duration")
+
+    def __init__(self):
+        self.start = array('d')
+        self.end = array('d')
+        self.duration = array('q')
+        self.debug_duration = array('q')
+
+    @classmethod
+    def from_json_file(cls, path):
+        history = cls()
+        with open(path, "r") as f:
+            history.read_json(f)
+        return history
+
+    def extend_dicts(self, sessions):
+        for session in sessions:
+            self._append_session(session)
+
+    def _append_session(self, session):
+        try:
+            self.append(
+                session.get("start", 0),
+                session.get("end", 0),
+                session.get("duration_sec", 0),
+                session.get("debug_duration_sec", 0),
+            )
+        except Exception:
+            # skip malformed entries rather than dropping the whole history
+            pass
+
+    def read_json(self, f, chunk_size=1 << 20):
+        # Counterpart of write_json: decodes the top-level array one element
+        # at a time straight into the columns, so neither the whole file text
+        # nor a dict per session is ever held at once.
+        decoder = json.JSONDecoder()
+        skip_ws = json.decoder.WHITESPACE.match
+        buf = ""
+        pos = 0
+        eof = False
+
+        def fill():
+            nonlocal buf, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+            buf = buf[pos:] + chunk
+            pos = 0
+
+        def peek():
+            nonlocal pos
+            while True:
+                pos = skip_ws(buf, pos).end()
+                if pos < len(buf) or eof:
+                    return buf[pos:pos + 1]
+                fill()
+
+        if peek() != "[":
+            raise ValueError("session history is not a JSON array")
+        pos += 1
+        if peek() == "]":
+            return
+        while True:
+            peek()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    fill()
+                    continue
+                if end < len(buf) or eof:
+                    break
+                # a number could continue in the next chunk
+                fill()
+            pos = end
+            if isinstance(value, dict):
+                self._append_session(value)
+
+            c = peek()
+            if c == "]":
+                return
+            if c != ",":
+                raise ValueError("malformed session history")
+            pos += 1
+
+    def append(self, start, end, duration_sec, debug_duration_sec):
+        # Convert everything before touching the columns so a bad field can't
+        # leave them at different lengths.
+        start = float(start)
+        end = float(end)
+        duration_sec = int(duration_sec)
+        debug_duration_sec = int(debug_duration_sec)
+        # write_json can't represent NaN/inf (json.load accepts them, but we'd
+        # write unparseable 'nan'), and array('q') rejects out-of-range ints.
+        if not (math.isfinite(start) and math.isfinite(end)):
+            raise ValueError("session timestamps must be finite")
+        if not (_INT64_MIN <= duration_sec <= _INT64_MAX and _INT64_MIN <= debug_duration_sec <= _INT64_MAX):
+            raise ValueError("session duration out of range")
+        self.start.append(start)
+        self.end.append(end)
+        self.duration.append(duration_sec)
+        self.debug_duration.append(debug_duration_sec)
+
+    def append_row(self, row):
+        self.append(*row)
+
+    def row(self, i):
+        return (self.start[i], self.end[i], self.duration[i], self.debug_duration[i])
+
+    def rows(self):
+        return zip(self.start, self.end, self.duration, self.debug_duration)
+
+    def __len__(self):
+        return len(self.start)
+
+    def __iter__(self):
+        for start, end, duration, debug_duration in self.rows():
+            yield {
+                "start": start,
+                "end": end,
+                "duration_sec": duration,
+                "debug_duration_sec": debug_duration,
+            }
+
+    def total_duration(self):
+        return sum(self.duration)
+
+    def total_debug_duration(self):
+        return sum(self.debug_duration)
+
+    def add_missing(self, other):
+        # Append every row of `other` not already in self. Only `other`
+        # (normally this session's rows) gets indexed; self is scanned once,
+        # so merging into a big history allocates nothing per stored row.
+        m = len(other)
+        if not m:
+            return
+        order = array('q', sorted(range(m), key=other.start.__getitem__))
+        starts = array('d', (other.start[i] for i in order))
+        lo = starts[0]
+        hi = starts[-1]
+        found = bytearray(m)
+        for k, start in enumerate(self.start):
+            if start < lo or start > hi:
+                continue
+            row = self.row(k)
+            i = bisect_left(starts, start)
+            while i < m and starts[i] == start:
+                j = order[i]
+                if other.row(j) == row:
+                    found[j] = 1
+                i += 1
+        for j in range(m):
+            if not found[j]:
+                self.append_row(other.row(j))
+
+    def merged_with(self, other):
+        merged = SessionHistory()
+        merged.start.extend(self.start)
+        merged.end.extend(self.end)
+        merged.duration.extend(self.duration)
+        merged.debug_duration.extend(self.debug_duration)
+        merged.add_missing(other)
+        return merged
+
+    def write_json(self, f):
+        # Stream rows instead of materialising a list of dicts; output matches
+        # json.dumps(list_of_sessions, indent=2).
+        if not len(self):
+            f.write("[]")
+            return
+        # Fixed template instead of json.dumps per row: indent=2 makes json
+        # fall back to its pure-Python encoder, which dominated save time.
+        # float repr is what json emits for finite floats.
+        row_json = (
+            '  {{\n    "start": {!r},\n    "end": {!r},\n'
+            '    "duration_sec": {},\n    "debug_duration_sec": {}\n  }}'
+        ).format
+        rows = self.rows()
+        f.write("[\n" + row_json(*next(rows)))
+        for row in rows:
+            f.write(",\n" + row_json(*row))
+        f.write("\n]")
+
+
+def load_session_history(path):
+    if os.path.exists(path):
+        try:
+            return SessionHistory.from_json_file(path)
+        except Exception:
+            pass
+    return SessionHistory()
+
+
+def save_session_history(path, sessions):
+    # reload before saving to get sessions saved by other instances
+    merged_sessions = load_session_history(path)
+    merged_sessions.add_missing(sessions)
+
+    with open(path, "w") as f:
+        merged_sessions.write_json(f)
+        f.flush()
+    return merged_sessions
+
+
+class SystemClock:
+    # monotonic() for measuring deltas, wall() for timestamps
+    def monotonic(self):
+        return time.monotonic()
+
+    def wall(self):
+        return time.time()
+
+
+class SimulatedClock:
+    # driven by hand, for replaying usage faster than real time
+    def __init__(self, wall_start=0.0):
+        self._monotonic = 0.0
+        self._wall = float(wall_start)
+
+    def monotonic(self):
+        return self._monotonic
+
+    def wall(self):
+        return self._wall
+
+    def advance(self, seconds):
+        self._monotonic += seconds
+        self._wall += seconds
+
+    def jump_wall(self, seconds):
+        # NTP correction, DST bug, user changing the system time, ...
+        self._wall += seconds
+
+    def suspend(self, seconds):
+        # Monotonic clocks generally don't advance while the machine sleeps.
+        self._wall += seconds
+
+
+class SessionAccounting:
+    # Reversing/debugging counters for one IDB session. Deltas come from the
+    # monotonic clock; the wall clock is only read when the session starts.
+    def __init__(self, clock=None, stop_re_count_when_debugging=False):
+        self.clock = clock or SystemClock()
+        self.stop_re_count_when_debugging = stop_re_count_when_debugging
+        self.start()
+
+    def start(self, db_elapsed=0, debug_elapsed=0, debugging=False):
+        now = self.clock.monotonic()
+        self.session_start = self.clock.wall()
+        self._session_start_monotonic = now
+        self.last_check = now
+        self.db_elapsed = db_elapsed
+        self.debug_elapsed = debug_elapsed
+        self.db_elapsed_start = db_elapsed
+        self.debug_elapsed_start = debug_elapsed
+        self.debugging = debugging
+
+    def tick(self, debugging):
+        now = self.clock.monotonic()
+        delta = max(0.0, now - self.last_check)
+        self.last_check = now
+        self.debugging = debugging
+
+        if debugging:
+            self.debug_elapsed += delta
+            if not self.stop_re_count_when_debugging:
+                self.db_elapsed += delta
+        else:
+            self.db_elapsed += delta
+        return delta
+
+    def shift(self, db_delta, debug_delta):
+        # Adjust the stored counters this session builds on, keeping the
+        # time already accounted in this session.
+        self.db_elapsed_start += db_delta
+        self.db_elapsed += db_delta
+        self.debug_elapsed_start += debug_delta
+        self.debug_elapsed += debug_delta
+
+    def session_elapsed(self):
+        return max(0.0, self.clock.monotonic() - self._session_start_monotonic)
+
+    def session_reverse(self):
+        return self.db_elapsed - self.db_elapsed_start
+
+    def session_debug(self):
+        return self.debug_elapsed - self.debug_elapsed_start
+
+    def session_row(self):
+        elapsed = self.session_elapsed()
+        return (
+            self.session_start,
+            self.session_start + elapsed,
+            int(elapsed),
+            int(self.session_debug())
+        )
+
+
+class _MemoryNetnode:
+    # dict-backed stand-in for the plugin netnode, used by simulate_usage()
+    def __init__(self):
+        self._alt = {}
+
+    def altval(self, idx):
+        return self._alt.get(idx, 0)
+
+    def altset(self, idx, value):
+        self._alt[idx] = int(value)
+        return True
+
+
+def _sim_check(ok, what):
+    # not assert: the checks must survive python -O
+    if not ok:
+        raise RuntimeError(f"[time_wasted] simulation check failed: {what}")
+
+
+def simulate_usage(days=365, sessions_per_day=3, idbs=20, seed=0, data_path=None,
+                   existing_sessions=0, stop_re_count_when_debugging=False, max_tick=None):
+    # Replays random sessions through the plugin's tick path on a
+    # SimulatedClock with an in-memory netnode per IDB, and optionally
+    # through save/load of `data_path`. Run it from the IDAPython console;
+    # raises RuntimeError if the counters disagree with the schedule.
+    rng = random.Random(seed)
+    clock = SimulatedClock(wall_start=1700000000.0)
+    plugin = IDAStatusBarTimerPlugin(clock=clock)
+    plugin.config = dict(DEFAULT_CONFIG)
+    plugin.config.update({
+        "stop_re_count_when_debugging": stop_re_count_when_debugging,
+        "global": True,
+        "per_idb": True,
+        "per_view": True,
+        # needs a live IDB and Hex-Rays
+        "analysis_wait": False
+    })
+    plugin._status_format = plugin._build_status_format()
+    plugin.plugin_sessions = SessionHistory()
+    plugin.global_elapsed = 0
+    plugin.global_debug_elapsed = 0
+    acct = plugin.accounting
+
+    netnodes = [_MemoryNetnode() for _ in range(idbs)]
+    idb_sessions = [0] * idbs
+    expected_idb = [[0.0, 0.0, 0.0] for _ in range(idbs)]  # reverse, debug, active
+    stats = {"sessions": 0, "ticks": 0, "wall_jumps": 0, "suspends": 0}
+
+    def run(seconds, debugging):
+        step = max_tick or seconds
+        while seconds > 0:
+            d = min(step, seconds)
+            clock.advance(d)
+            plugin._on_tick(debugging)
+            stats["ticks"] += 1
+            seconds -= d
+
+    began = time.perf_counter()
+    for _ in range(days):
+        for _ in range(sessions_per_day):
+            idb = rng.randrange(idbs)
+            nn = netnodes[idb]
+            plugin._start_idb_session(nn, False)
+            active = expected_reverse = expected_debug = 0.0
+
+            for _ in range(rng.randint(1, 12)):
+                plugin._set_view_index(rng.randrange(len(VIEW_NAMES)))
+                debugging = rng.random() < 0.3
+                length = rng.uniform(30.0, 3600.0)
+                run(length, debugging)
+                active += length
+                if debugging:
+                    expected_debug += length
+                if not (debugging and stop_re_count_when_debugging):
+                    expected_reverse += length
+
+                r = rng.random()
+                if r < 0.05:
+                    clock.jump_wall(rng.uniform(-7200.0, 7200.0))
+                    stats["wall_jumps"] += 1
+                elif r < 0.10:
+                    clock.suspend(rng.uniform(60.0, 8 * 3600.0))
+                    stats["suspends"] += 1
+
+            _sim_check(abs(acct.session_reverse() - expected_reverse) < 1e-6 * max(1.0, expected_reverse),
+                       "session reversing time")
+            _sim_check(abs(acct.session_debug() - expected_debug) < 1e-6 * max(1.0, expected_debug),
+                       "session debugging time")
+            text = plugin._render_status()
+            _sim_check(f"this idb: {format_elapsed(int(acct.db_elapsed))}" in text, "status text")
+
+            plugin._end_idb_session()
+            start, end, duration, debug_duration = plugin.plugin_sessions.row(len(plugin.plugin_sessions) - 1)
+            _sim_check(abs((end - start) - active) < 1e-3, "session end anchored to monotonic time")
+            _sim_check(abs(duration - active) <= 1, "session duration")
+            _sim_check(abs(debug_duration - expected_debug) <= 1, "session debug duration")
+            _sim_check(nn.altval(NETNODE_DB_TIME_KEY) == int(acct.db_elapsed), "persisted idb time")
+            _sim_check(nn.altval(NETNODE_DEBUG_TIME_KEY) == int(acct.debug_elapsed), "persisted idb debug time")
+
+            idb_sessions[idb] += 1
+            expected_idb[idb][0] += expected_reverse
+            expected_idb[idb][1] += expected_debug
+            expected_idb[idb][2] += active
+            stats["sessions"] += 1
+
+            # IDA closed until the next session
+            clock.advance(rng.uniform(600.0, 6 * 3600.0))
+
+    for idb in range(idbs):
+        nn = netnodes[idb]
+        # each session can drop <1s per counter to the integer round trip
+        slack = idb_sessions[idb] + 1
+        _sim_check(abs(nn.altval(NETNODE_DB_TIME_KEY) - expected_idb[idb][0]) <= slack, f"idb {idb} time")
+        _sim_check(abs(nn.altval(NETNODE_DEBUG_TIME_KEY) - expected_idb[idb][1]) <= slack, f"idb {idb} debug time")
+        views = sum(nn.altval(NETNODE_VIEW_TIME_KEY_BASE + i) for i in range(len(VIEW_NAMES)))
+        view_slack = slack * len(VIEW_NAMES) + stats["ticks"] * 0.0005
+        _sim_check(abs(views - expected_idb[idb][2]) <= view_slack, f"idb {idb} per-view time")
+
+    history = plugin.plugin_sessions
+    stats["simulate_sec"] = time.perf_counter() - began
+    stats["global_elapsed"] = history.total_duration()
+    stats["global_debug_elapsed"] = history.total_debug_duration()
+
+    if data_path:
+        if existing_sessions:
+            seeded = SessionHistory()
+            for i in range(existing_sessions):
+                seeded.append(1000000000.0 + i * 7200.0, 1000000000.0 + i * 7200.0 + 3600.0, 3600, i % 600)
+            with open(data_path, "w") as f:
+                seeded.write_json(f)
+            del seeded
+
+        began = time.perf_counter()
+        save_session_history(data_path, history)
+        stats["save_sec"] = time.perf_counter() - began
+
+        began = time.perf_counter()
+        loaded = load_session_history(data_path)
+        stats["load_sec"] = time.perf_counter() - began
+        _sim_check(len(loaded) == existing_sessions + len(history), "saved history length")
+        stats["saved_sessions"] = len(loaded)
+
+    return stats
+
+
 def PLUGIN_ENTRY():
     return IDAStatusBarTimerPlugin()
 
 
+class _UIEvents(idaapi.UI_Hooks):
+    # Follows widget activation so the tick only has to bump one counter.
+    def __init__(self, plugin):
+        super().__init__()
+        self.plugin = plugin
+
+    def current_widget_changed(self, widget, prev_widget):
+        try:
+            self.plugin._set_active_view(widget)
+        except Exception:
+            pass
+
+    def plugin_loaded(self, plugin_info):
+        # Hex-Rays may be loaded after us; hook it as soon as it shows up.
+        try:
+            self.plugin._install_decompile_timer()
+        except Exception:
+            pass
+
+
+class _AnalysisHooks(idaapi.IDP_Hooks):
+    # Fires each time an analysis queue drains, reanalysis included
+    # (auto_empty_finally only comes once per database).
+    def __init__(self, plugin):
+        super().__init__()
+        self.plugin = plugin
+
+    def ev_auto_queue_empty(self, qtype):
+        try:
+            self.plugin._analysis_queue_empty(self.plugin.clock.monotonic())
+        except Exception:
+            pass
+        return 0
+
+
+class _AnalysisStartHooks(idaapi.IDB_Hooks):
+    # Only hooked while the analysis queue is idle: the first change made by
+    # the analyser marks the start of a run, then these get detached again
+    # so a running analysis doesn't pay for them.
+    def __init__(self, plugin):
+        super().__init__()
+        self.plugin = plugin
+
+    def _mark(self):
+        try:
+            # The same events fire for the user's own edits; only count
+            # changes made while the analyser has work queued.
+            if not idaapi.auto_is_ok():
+                self.plugin._analysis_begin(self.plugin.clock.monotonic())
+        except Exception:
+            pass
+        return 0
+
+    def make_code(self, *args):
+        return self._mark()
+
+    def make_data(self, *args):
+        return self._mark()
+
+    def func_added(self, *args):
+        return self._mark()
+
+    def func_updated(self, *args):
+        return self._mark()
+
+
+if ida_hexrays is not None:
+    class _DecompileTimer(ida_hexrays.Hexrays_Hooks):
+        # Measures flowchart -> final maturity, i.e. the whole decompilation.
+        # Cached pseudocode never reaches flowchart, so it isn't counted.
+        # Hex-Rays decompiles one function at a time, so a single pending
+        # slot is enough; a new start or an internal error discards a run
+        # that failed or was cancelled and never reached CMAT_FINAL.
+        def __init__(self, plugin):
+            super().__init__()
+            self.plugin = plugin
+            self._pending = None  # (entry_ea, clock.monotonic() at start)
+
+        def _start(self, ea):
+            self._pending = (ea, self.plugin.clock.monotonic())
+
+        def flowchart(self, fc, *args):
+            try:
+                mba = args[0] if args else None
+                if mba is not None and hasattr(mba, "entry_ea"):
+                    ea = mba.entry_ea
+                else:
+                    # older IDA only passes the flowchart
+                    ea = fc.bounds.start_ea
+                self._start(ea)
+            except Exception:
+                self._pending = None
+            return 0
+
+        def prolog(self, mba, *args):
+            # Fallback for versions where flowchart didn't give us the entry.
+            try:
+                if self._pending is None or self._pending[0] != mba.entry_ea:
+                    self._start(mba.entry_ea)
+            except Exception:
+                pass
+            return 0
+
+        def interr(self, errcode):
+            self._pending = None
+            return 0
+
+        def maturity(self, cfunc, new_maturity):
+            try:
+                if new_maturity == ida_hexrays.CMAT_FINAL:
+                    pending = self._pending
+                    self._pending = None
+                    if pending is not None and pending[0] == cfunc.entry_ea:
+                        self.plugin._record_decompile((self.plugin.clock.monotonic() - pending[1]) * 1000)
+            except Exception:
+                pass
+            return 0
+else:
+    _DecompileTimer = None
+
+
 class _SBWatcher(QObject):
     def __init__(self, plugin, *watched_widgets):
         # parent to plugin label/container (they share the same Qt thread)
@@ -121,6 +802,189 @@ class _SBWatcher(QObject):
                 pass
         return super().eventFilter(obj, event)
 
+
+def _text_advance(fm, text):
+    try:
+        return int(fm.horizontalAdvance(text))
+    except AttributeError:
+        # Qt < 5.11
+        return int(fm.width(text))
+
+
+class _StatusText(QWidget):
+    # Lightweight replacement for QLabel. Text is split into runs (each digit
+    # is its own run) which are painted from cached QStaticText objects.
+    # Digits sit in fixed-width cells, so a ticking timer never changes the
+    # widget width and only the cells whose digit changed get repainted.
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._text = ""
+        self._cells = []  # (x, cell_width, glyph_offset, run)
+        self._width = 0
+        self._max_width = None
+        self._glyphs = {}
+        self._advances = {}
+        # Elided text changes every tick, so it gets a single slot instead
+        # of going into the glyph cache.
+        self._elided_run = None
+        self._elided_glyph = None
+        self._digit_w = 0
+        self._tooltip_provider = None
+        self._reset_metrics()
+
+    def _reset_metrics(self):
+        self._glyphs = {}
+        self._advances = {}
+        self._elided_run = None
+        self._elided_glyph = None
+        fm = self.fontMetrics()
+        self._digit_w = max(_text_advance(fm, d) for d in "0123456789")
+
+    def _advance(self, run):
+        w = self._advances.get(run)
+        if w is None:
+            w = _text_advance(self.fontMetrics(), run)
+            self._advances[run] = w
+        return w
+
+    def _make_glyph(self, run):
+        st = QStaticText(run)
+        try:
+            st.setTextFormat(Qt.PlainText)
+        except Exception:
+            pass
+        return st
+
+    def _glyph(self, run):
+        if run == self._elided_run:
+            if self._elided_glyph is None:
+                self._elided_glyph = self._make_glyph(run)
+            return self._elided_glyph
+        st = self._glyphs.get(run)
+        if st is None:
+            st = self._make_glyph(run)
+            self._glyphs[run] = st
+        return st
+
+    def _layout(self, text):
+        cells = []
+        x = 0
+        i = 0
+        n = len(text)
+        while i < n:
+            if text[i].isdigit():
+                run = text[i]
+                cells.append((x, self._digit_w, (self._digit_w - self._advance(run)) // 2, run))
+                x += self._digit_w
+                i += 1
+                continue
+            j = i
+            while j < n and not text[j].isdigit():
+                j += 1
+            run = text[i:j]
+            w = self._advance(run)
+            cells.append((x, w, 0, run))
+            x += w
+            i = j
+
+        if self._max_width is not None and x > self._max_width:
+            # Doesn't fit: fall back to a single elided run. This only happens
+            # on very narrow windows, so per-digit damage tracking isn't worth it.
+            fm = self.fontMetrics()
+            shown = fm.elidedText(text, Qt.ElideMiddle, int(self._max_width))
+            if shown != self._elided_run:
+                self._elided_run = shown
+                self._elided_glyph = None
+            w = _text_advance(fm, shown)
+            return [(0, w, 0, shown)], w
+
+        self._elided_run = None
+        self._elided_glyph = None
+        return cells, x
+
+    def _relayout(self, force_full=False):
+        old_cells = self._cells
+        cells, width = self._layout(self._text)
+        self._cells = cells
+
+        if width != self._width:
+            self._width = width
+            self.updateGeometry()
+            self.update()
+            return True
+
+        if force_full or len(old_cells) != len(cells):
+            self.update()
+            return False
+
+        h = self.height()
+        for old, new in zip(old_cells, cells):
+            if old != new:
+                self.update(QRect(int(new[0]), 0, int(new[1]), h))
+        return False
+
+    def text(self):
+        return self._text
+
+    def setText(self, text):
+        # Returns True when the natural width changed and the caller has to
+        # re-position the widget; otherwise no geometry work is triggered.
+        if text == self._text:
+            return False
+        self._text = text
+        return self._relayout()
+
+    def setMaximumTextWidth(self, width):
+        width = None if width is None else int(width)
+        if width == self._max_width:
+            return False
+        self._max_width = width
+        return self._relayout(force_full=True)
+
+    def setTooltipProvider(self, provider):
+        self._tooltip_provider = provider
+
+    def sizeHint(self):
+        return QSize(int(self._width), int(self.fontMetrics().height()))
+
+    def minimumSizeHint(self):
+        return self.sizeHint()
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.FontChange:
+            self._reset_metrics()
+            self._relayout(force_full=True)
+        super().changeEvent(event)
+
+    def event(self, event):
+        if event.type() == QEvent.ToolTip:
+            # Built lazily so the tick path never has to call setToolTip.
+            tip = self._text
+            if self._tooltip_provider is not None:
+                try:
+                    tip = self._tooltip_provider()
+                except Exception:
+                    pass
+            QToolTip.showText(event.globalPos(), tip, self)
+            return True
+        return super().event(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        try:
+            painter.setPen(self.palette().color(self.foregroundRole()))
+            painter.setFont(self.font())
+            rect = event.rect()
+            left = rect.left()
+            right = rect.right()
+            y = max(0, (self.height() - self.fontMetrics().height()) // 2)
+            for x, w, dx, run in self._cells:
+                if x + w < left or x > right:
+                    continue
+                painter.drawStaticText(QPointF(x + dx, y), self._glyph(run))
+        finally:
+            painter.end()
+
 class IDAStatusBarTimerPlugin(idaapi.plugin_t):
     flags = idaapi.PLUGIN_UNL
     comment = "Determine how much time you've wasted staring at dissassemblers"
@@ -128,9 +992,10 @@ class IDAStatusBarTimerPlugin(idaapi.plugin_t):
     wanted_name = "Time Wasted"
     wanted_hotkey = ""
 
-    def __init__(self):
+    def __init__(self, clock=None):
         self.label = None
         self.timer = None
+        self._config_timer = None
         self.netnode = None
         self.status_container = None
         self.separator = None
@@ -152,26 +1017,27 @@ class IDAStatusBarTimerPlugin(idaapi.plugin_t):
         self._sb_full_text = ""
         self._sb_margin = 8
         self._sb_top_margin = 0
+        self._ui_hooks = None
+        self._analysis_hooks = None
+        self._analysis_start_hooks = None
+        self._decompile_timer = None
         
-        self.config = {
-            "stop_re_count_when_debugging": False,
-            "global": True,
-            "global_debug": True,
-            "per_idb": True,
-            "per_idb_debug": True,
-            "per_session": True,
-            "per_session_debug": True
-        }
-
-        self.db_elapsed = 0
-        self.debug_elapsed = 0
+        self.config = dict(DEFAULT_CONFIG)
+        self._status_format = ""
+
+        self.clock = clock or SystemClock()
+        self.accounting = SessionAccounting(self.clock)
+        # Milliseconds per VIEW_* bucket, indexed by self._view_idx.
+        self.view_elapsed_ms = array('q', [0] * len(VIEW_NAMES))
+        self._view_idx = VIEW_OTHER
+        # Stored value already folded into the in-memory counter, per netnode
+        # key that isn't currently written; see _attach_idb_counters().
+        self._idb_included = {}
+        self._reset_wait_counters()
         self.global_debug_elapsed = 0
-        self.last_check = time.time()
-        self.debugging = False
-        self.session_start = time.time()
         self.plugin_config_path = os.path.join(ida_diskio.get_user_idadir(), "time_wasted.config.json")
         self.plugin_data_path = os.path.join(ida_diskio.get_user_idadir(), "time_wasted.global_data.json")
-        self.plugin_sessions = []
+        self.plugin_sessions = SessionHistory()
 
     def _capture_statusbar_originals(self):
         sb = self._sb
@@ -300,6 +1166,14 @@ class IDAStatusBarTimerPlugin(idaapi.plugin_t):
                 pass
             self.timer = None
 
+        if self._config_timer:
+            try:
+                self._config_timer.stop()
+                self._config_timer.deleteLater()
+            except Exception:
+                pass
+            self._config_timer = None
+
         if self.label:
             try:
                 self.label.deleteLater()
@@ -353,25 +1227,10 @@ class IDAStatusBarTimerPlugin(idaapi.plugin_t):
         margin = int(self._sb_margin)
         available = max(10, int(w) - (margin * 2))
 
-        shown = self._sb_full_text
-        if QFontMetrics is not None:
-            try:
-                fm = QFontMetrics(self.label.font())
-                shown = fm.elidedText(self._sb_full_text, Qt.ElideMiddle, available)
-            except Exception:
-                shown = self._sb_full_text
-
-        # Put the *label widget itself* at the top-right.
-        self.label.setText(shown)
-        try:
-            self.label.setToolTip(self._sb_full_text)
-        except Exception:
-            pass
-
-        try:
-            self.label.adjustSize()
-        except Exception:
-            pass
+        # Put the *label widget itself* at the top-right. Both calls are no-ops
+        # unless the text or the available width actually changed.
+        self.label.setMaximumTextWidth(available)
+        self.label.setText(self._sb_full_text)
 
         # Ensure the label doesn't overlap the separator line at the bottom.
         # Reserve equal gap above and below separator for centering.
@@ -436,6 +1295,14 @@ class IDAStatusBarTimerPlugin(idaapi.plugin_t):
             return 0
 
         def _on_close_idb(*args):
+            try:
+                self._persist_idb_counters(full=True)
+            except Exception:
+                pass
+            try:
+                self._unhook_ida()
+            except Exception:
+                pass
             try:
                 self._teardown_ui()
             except Exception:
@@ -476,15 +1343,276 @@ class IDAStatusBarTimerPlugin(idaapi.plugin_t):
         except Exception:
             pass
     
-    def load_plugin_config(self):
-        if not os.path.exists(self.plugin_config_path):
+    def _install_ida_hooks(self):
+        self._unhook_ida()
+        self._view_idx = VIEW_OTHER
+        if self.config["per_view"]:
+            try:
+                self._set_active_view(idaapi.get_current_widget())
+            except Exception:
+                pass
+
+        try:
+            ui_hooks = _UIEvents(self)
+            if ui_hooks.hook():
+                self._ui_hooks = ui_hooks
+        except Exception as e:
+            print(f"[time_wasted] Failed to hook UI events: {e}")
+
+        if self.config["analysis_wait"]:
+            try:
+                analysis_hooks = _AnalysisHooks(self)
+                if analysis_hooks.hook():
+                    self._analysis_hooks = analysis_hooks
+            except Exception as e:
+                print(f"[time_wasted] Failed to hook auto-analysis events: {e}")
+            if self._analysis_busy_since is None:
+                self._hook_analysis_start()
+            self._install_decompile_timer()
+
+    def _install_decompile_timer(self):
+        if self._decompile_timer is not None or _DecompileTimer is None:
+            return
+        if not self.config["analysis_wait"]:
+            return
+        try:
+            if not ida_hexrays.init_hexrays_plugin():
+                return
+            timer = _DecompileTimer(self)
+            if timer.hook():
+                self._decompile_timer = timer
+        except Exception:
+            pass
+
+    def _unhook_ida(self):
+        for attr in ("_ui_hooks", "_analysis_hooks", "_analysis_start_hooks", "_decompile_timer"):
+            hooks = getattr(self, attr)
+            if hooks:
+                try:
+                    hooks.unhook()
+                except Exception:
+                    pass
+                setattr(self, attr, None)
+
+    def _reset_wait_counters(self):
+        self.analysis_initial_sec = 0.0
+        self.analysis_initial_done = False
+        self.analysis_queue_sec = 0.0
+        self._analysis_busy_since = None
+        self._analysis_idle_at = None
+        self._analysis_end_pending = False
+        self.decompile_count = 0
+        self.decompile_total_ms = 0
+        self.decompile_max_ms = 0
+        self.decompile_hist = array('q', [0] * (len(DECOMPILE_LATENCY_BUCKETS_MS) + 1))
+
+    def _load_wait_counters(self):
+        self._reset_wait_counters()
+        if not self.netnode or not self.config["per_idb"]:
+            return
+        nn = self.netnode
+        self.analysis_initial_sec = float(nn.altval(NETNODE_ANALYSIS_INITIAL_KEY))
+        self.analysis_initial_done = nn.altval(NETNODE_ANALYSIS_DONE_KEY) != 0
+        self.analysis_queue_sec = float(nn.altval(NETNODE_ANALYSIS_QUEUE_KEY))
+        self.decompile_count = nn.altval(NETNODE_DECOMPILE_COUNT_KEY)
+        self.decompile_total_ms = nn.altval(NETNODE_DECOMPILE_TOTAL_MS_KEY)
+        self.decompile_max_ms = nn.altval(NETNODE_DECOMPILE_MAX_MS_KEY)
+        for i in range(len(self.decompile_hist)):
+            self.decompile_hist[i] = nn.altval(NETNODE_DECOMPILE_HIST_KEY_BASE + i)
+
+    def _persist_analysis_counters(self):
+        if not self.netnode or not self.config["per_idb"]:
+            return
+        self.netnode.altset(NETNODE_ANALYSIS_INITIAL_KEY, int(self.analysis_initial_sec))
+        self.netnode.altset(NETNODE_ANALYSIS_DONE_KEY, 1 if self.analysis_initial_done else 0)
+        self.netnode.altset(NETNODE_ANALYSIS_QUEUE_KEY, int(self.analysis_queue_sec))
+
+    def _persist_decompile_counters(self, bucket=None):
+        if not self.netnode or not self.config["per_idb"]:
+            return
+        self.netnode.altset(NETNODE_DECOMPILE_COUNT_KEY, int(self.decompile_count))
+        self.netnode.altset(NETNODE_DECOMPILE_TOTAL_MS_KEY, int(self.decompile_total_ms))
+        self.netnode.altset(NETNODE_DECOMPILE_MAX_MS_KEY, int(self.decompile_max_ms))
+        buckets = range(len(self.decompile_hist)) if bucket is None else (bucket,)
+        for i in buckets:
+            self.netnode.altset(NETNODE_DECOMPILE_HIST_KEY_BASE + i, int(self.decompile_hist[i]))
+
+    def _hook_analysis_start(self):
+        if self._analysis_start_hooks is not None or self._analysis_hooks is None:
+            return
+        try:
+            hooks = _AnalysisStartHooks(self)
+            if hooks.hook():
+                self._analysis_start_hooks = hooks
+        except Exception:
+            pass
+
+    def _unhook_analysis_start(self):
+        # Deferred from _analysis_begin; the run may already be over.
+        if self._analysis_busy_since is None or self._analysis_start_hooks is None:
+            return
+        try:
+            self._analysis_start_hooks.unhook()
+        except Exception:
+            pass
+        self._analysis_start_hooks = None
+
+    def _analysis_begin(self, now):
+        if self._analysis_busy_since is not None:
+            return
+        self._analysis_busy_since = now
+        if self._analysis_start_hooks is not None:
+            # Don't unhook from inside the hook's own callback.
+            QTimer.singleShot(0, self._unhook_analysis_start)
+
+    def _start_analysis_tracking(self):
+        # Drop any run left over from before and pick up the current state;
+        # called on init and whenever analysis_wait is toggled.
+        self._analysis_busy_since = None
+        self._analysis_end_pending = False
+        if not self.config["analysis_wait"]:
+            return
+        if not idaapi.auto_is_ok():
+            self._analysis_begin(self.clock.monotonic())
+        elif not self.analysis_initial_done:
+            # Analysis finished before we were tracking this IDB; duration unknown.
+            self.analysis_initial_done = True
+
+    def _analysis_queue_empty(self, now):
+        if self._analysis_busy_since is None:
+            return
+        self._analysis_idle_at = now
+        if not self._analysis_end_pending:
+            # One queue draining doesn't mean the others are; look at the
+            # whole state once control is back in the event loop.
+            self._analysis_end_pending = True
+            QTimer.singleShot(0, self._check_analysis_done)
+
+    def _check_analysis_done(self):
+        self._analysis_end_pending = False
+        if self._analysis_busy_since is not None and idaapi.auto_is_ok():
+            self._analysis_end(self._analysis_idle_at)
+
+    def _analysis_end(self, now):
+        since = self._analysis_busy_since
+        if since is None:
+            return
+        self._analysis_busy_since = None
+        self._hook_analysis_start()
+        elapsed = max(0.0, now - since)
+        self.analysis_queue_sec += elapsed
+        if not self.analysis_initial_done:
+            self.analysis_initial_sec += elapsed
+            self.analysis_initial_done = True
+        self._persist_analysis_counters()
+
+    def _record_decompile(self, ms):
+        ms = int(ms)
+        bucket = decompile_bucket_index(ms)
+        self.decompile_count += 1
+        self.decompile_total_ms += ms
+        self.decompile_max_ms = max(self.decompile_max_ms, ms)
+        self.decompile_hist[bucket] += 1
+        self._persist_decompile_counters(bucket)
+
+    def _set_active_view(self, widget):
+        self._set_view_index(view_index_for_widget(widget))
+
+    def _set_view_index(self, idx):
+        if idx == self._view_idx:
+            return
+        prev = self._view_idx
+        self._view_idx = idx
+        # The tick only writes the active bucket, so flush the one we're leaving.
+        if self.netnode and self.config["per_idb"] and self.config["per_view"]:
+            self.netnode.altset(NETNODE_VIEW_TIME_KEY_BASE + prev, self.view_elapsed_ms[prev] // 1000)
+
+    def _persist_idb_counters(self, full=False):
+        if not self.netnode or not self.config["per_idb"]:
+            return
+        self.netnode.altset(NETNODE_DB_TIME_KEY, int(self.accounting.db_elapsed))
+        self.netnode.altset(NETNODE_DEBUG_TIME_KEY, int(self.accounting.debug_elapsed))
+        if full and self.config["per_view"]:
+            # Per tick only the in-memory bucket moves; the view counters are
+            # written when the view changes and here on close.
+            for i in range(len(self.view_elapsed_ms)):
+                self.netnode.altset(NETNODE_VIEW_TIME_KEY_BASE + i, self.view_elapsed_ms[i] // 1000)
+        if full and self.config["analysis_wait"]:
+            self._persist_analysis_counters()
+            self._persist_decompile_counters()
+
+    def _status_tooltip(self):
+        tip = self.label.text() if self.label else ""
+        total = sum(self.view_elapsed_ms)
+        if self.config["per_view"] and total:
+            scope = "this idb" if self.config["per_idb"] else "this session"
+            lines = [f"Time by view ({scope}):"]
+            order = sorted(range(len(VIEW_NAMES)), key=self.view_elapsed_ms.__getitem__, reverse=True)
+            for i in order:
+                ms = self.view_elapsed_ms[i]
+                if not ms:
+                    continue
+                lines.append(f"  {VIEW_NAMES[i]}: {format_elapsed(ms // 1000)} ({ms * 100 // total}%)")
+            tip += "\n\n" + "\n".join(lines)
+        if self.config["analysis_wait"]:
+            tip += "\n\n" + "\n".join(self._wait_tooltip_lines())
+        return tip
+
+    def _wait_tooltip_lines(self):
+        queued = self.analysis_queue_sec
+        initial = self.analysis_initial_sec
+        if self._analysis_busy_since is not None:
+            running = max(0.0, self.clock.monotonic() - self._analysis_busy_since)
+            queued += running
+            if not self.analysis_initial_done:
+                initial += running
+        if self.analysis_initial_done and not initial:
+            initial_text = "n/a"
+        else:
+            initial_text = format_elapsed(int(initial))
+            if not self.analysis_initial_done:
+                initial_text += " (running)"
+        lines = [f"Auto-analysis: initial {initial_text} | queued {format_elapsed(int(queued))}"]
+
+        if self.decompile_count:
+            avg = self.decompile_total_ms // self.decompile_count
+            lines.append(f"Decompiler: {self.decompile_count} functions, avg {avg} ms, max {self.decompile_max_ms} ms")
+            for i, count in enumerate(self.decompile_hist):
+                if count:
+                    lines.append(f"  {decompile_bucket_label(i)}: {count}")
+        else:
+            lines.append("Decompiler: no functions decompiled")
+        return lines
+
+    def load_plugin_config(self, keep_on_error=False):
+        file_key = _config_file_key(self.plugin_config_path)
+        if file_key is None:
             self.save_plugin_config()
             return
 
+        cached = _config_cache.get(self.plugin_config_path)
+        if cached is not None and cached[0] == file_key:
+            self.config = dict(cached[1])
+            return
+
         try:
             with open(self.plugin_config_path, "r") as f:
-                self.config = json.load(f)
+                loaded = json.load(f)
+            config = dict(DEFAULT_CONFIG)
+            config.update(loaded)
+            self.config = config
+            if any(key not in loaded for key in DEFAULT_CONFIG):
+                # write newly added options back so the file lists all of them
+                self.save_plugin_config()
+            else:
+                _config_cache[self.plugin_config_path] = (file_key, dict(config))
         except Exception as e:
+            if keep_on_error:
+                # Likely caught mid-edit; never overwrite the user's file from
+                # the poll, and don't re-read it until it changes again.
+                print(f"[time_wasted] Failed to load config, keeping current settings: {e}")
+                _config_cache[self.plugin_config_path] = (file_key, dict(self.config))
+                return
             print(f"[time_wasted] Failed to load config, using defaults: {e}")
             self.save_plugin_config()
 
@@ -492,36 +1620,186 @@ class IDAStatusBarTimerPlugin(idaapi.plugin_t):
         try:
             with open(self.plugin_config_path, "w") as f:
                 json.dump(self.config, f, indent=4)
+            key = _config_file_key(self.plugin_config_path)
+            if key is not None:
+                _config_cache[self.plugin_config_path] = (key, dict(self.config))
         except Exception as e:
-            print(f"[time_wasted] Failed to save config: {e}")    
-                
-    def load_plugin_data(self):
-        if os.path.exists(self.plugin_data_path):
-            try:
-                with open(self.plugin_data_path, "r") as f:
-                    self.plugin_sessions = json.load(f)
-            except Exception:
-                self.plugin_sessions = []
-        else:
-            self.plugin_sessions = []
+            print(f"[time_wasted] Failed to save config: {e}")
 
-    def save_plugin_data(self):
+    def _check_config(self):
+        # Cheap stat on a slow timer; only re-reads the file when it changed.
+        key = _config_file_key(self.plugin_config_path)
+        if key is None:
+            return
+        cached = _config_cache.get(self.plugin_config_path)
+        if cached is not None and cached[0] == key:
+            return
+
+        old_config = dict(self.config)
+        self.load_plugin_config(keep_on_error=True)
         try:
-            # reload before saving to get sessions saved by other instances
-            if os.path.exists(self.plugin_data_path):
-                with open(self.plugin_data_path, "r") as f:
-                    try:
-                        existing_sessions = json.load(f)
-                    except Exception:
-                        existing_sessions = []
+            self._apply_config_change(old_config)
+        except Exception as e:
+            print(f"[time_wasted] Failed to apply config change: {e}")
+
+    def _apply_config_change(self, old_config):
+        changed = {k for k in self.config if self.config.get(k) != old_config.get(k)}
+        if not changed:
+            return
+
+        acct = self.accounting
+        acct.stop_re_count_when_debugging = self.config["stop_re_count_when_debugging"]
+
+        if "global" in changed and self.config["global"]:
+            self.load_plugin_data()
+            self.global_elapsed = self.plugin_sessions.total_duration()
+            self.global_debug_elapsed = self.plugin_sessions.total_debug_duration()
+
+        old_keys = _idb_counter_keys(old_config)
+        new_keys = _idb_counter_keys(self.config)
+        self._detach_idb_counters([k for k in old_keys if k not in new_keys])
+        attached = [k for k in new_keys if k not in old_keys]
+        if attached:
+            if self.netnode is None:
+                self.netnode = idaapi.netnode(NETNODE_NAME, 0, 1)
+            self._attach_idb_counters(attached)
+
+        if "per_idb" in changed and self.config["per_idb"]:
+            busy_since = self._analysis_busy_since
+            self._load_wait_counters()
+            self._analysis_busy_since = busy_since
+
+        if attached:
+            self._persist_idb_counters(full=True)
+
+        if "analysis_wait" in changed:
+            self._start_analysis_tracking()
+        if "analysis_wait" in changed or "per_view" in changed:
+            self._install_ida_hooks()
+
+        print(f"[time_wasted] Config reloaded ({', '.join(sorted(changed))})")
+
+        self._status_format = self._build_status_format()
+        self._render_status()
+
+    def _build_status_format(self):
+        # Only the numbers change per tick; the layout of the text is fixed
+        # by the config and rebuilt when it changes.
+        cfg = self.config
+        fmt = "Time wasted reversing"
+        if cfg["global"]:
+            fmt += ": {global_re}"
+            if cfg["global_debug"]:
+                fmt += " | debugging: {global_debug}"
+
+        if cfg["per_idb"]:
+            if cfg["global"]:
+                fmt += " ["
             else:
-                existing_sessions = []
+                fmt += " "
+            fmt += "this idb: {idb_re}"
+            if cfg["per_idb_debug"]:
+                fmt += " | "
+                if not (cfg["global"] and cfg["global_debug"]):
+                    fmt += "debugging: "
+                fmt += "{idb_debug}"
+            if cfg["global"]:
+                fmt += "]"
+
+        if cfg["per_session"]:
+            if cfg["global"] or cfg["per_idb"]:
+                fmt += " ["
+            fmt += "this session: {session_re}"
+            if cfg["per_session_debug"]:
+                fmt += " | "
+                if not (cfg["global"] and cfg["global_debug"]) and not (cfg["per_idb"] and cfg["per_idb_debug"]):
+                    fmt += "debugging: "
+                fmt += "{session_debug}"
+            if cfg["global"] or cfg["per_idb"]:
+                fmt += " ]"
+        return fmt
+
+    def _render_status(self):
+        acct = self.accounting
+        session_debug = acct.session_debug()
+        text = self._status_format.format(
+            global_re=format_elapsed(self.global_elapsed + int(acct.session_elapsed())),
+            global_debug=format_elapsed(self.global_debug_elapsed + int(session_debug)),
+            idb_re=format_elapsed(int(acct.db_elapsed)),
+            idb_debug=format_elapsed(int(acct.debug_elapsed)),
+            session_re=format_elapsed(int(acct.session_reverse())),
+            session_debug=format_elapsed(int(session_debug)),
+        )
+
+        if not self.label:
+            return text
+        if self._use_overlay and self.status_container:
+            self._sb_full_text = text
+            # Only re-position when the painted width changed; digit
+            # changes just repaint their own cells.
+            if self.label.setText(text):
+                try:
+                    self._overlay_relayout()
+                except Exception:
+                    pass
+        else:
+            self.label.setText(text)
+        return text
+
+    def _start_idb_session(self, netnode, debugging):
+        self.netnode = netnode
+        self.view_elapsed_ms = array('q', [0] * len(VIEW_NAMES))
+        acct = self.accounting
+        acct.stop_re_count_when_debugging = self.config["stop_re_count_when_debugging"]
+        acct.start(0, 0, debugging)
+
+        self._idb_included = {}
+        if netnode:
+            self._attach_idb_counters(_idb_counter_keys(self.config))
+        self._load_wait_counters()
+
+    def _add_to_idb_counter(self, key, delta):
+        if key == NETNODE_DB_TIME_KEY:
+            self.accounting.shift(delta, 0)
+        elif key == NETNODE_DEBUG_TIME_KEY:
+            self.accounting.shift(0, delta)
+        else:
+            self.view_elapsed_ms[key - NETNODE_VIEW_TIME_KEY_BASE] += delta * 1000
+
+    def _attach_idb_counters(self, keys):
+        # Start writing these counters to the netnode. Fold in what it stores,
+        # minus what the counter already includes from an earlier attach, so
+        # toggling per_idb/per_view never counts the stored time twice.
+        for key in keys:
+            stored = self.netnode.altval(key)
+            self._add_to_idb_counter(key, stored - self._idb_included.pop(key, 0))
+
+    def _detach_idb_counters(self, keys):
+        # Stop writing these counters; the in-memory values keep running on
+        # top of what the netnode holds now.
+        for key in keys:
+            self._idb_included[key] = self.netnode.altval(key) if self.netnode else 0
+
+    def _end_idb_session(self):
+        if self.config["global"]:
+            self.plugin_sessions.append(*self.accounting.session_row())
+        self._persist_idb_counters(full=True)
 
-            merged_sessions = existing_sessions + [s for s in self.plugin_sessions if s not in existing_sessions]
-    
-            with open(self.plugin_data_path, "w") as f:
-                f.write(json.dumps(merged_sessions, indent=2))
-                f.flush()
+    def _on_timer(self):
+        self._on_tick(idaapi.is_debugger_on())
+
+    def _on_tick(self, debugging):
+        delta = self.accounting.tick(debugging)
+        self.view_elapsed_ms[self._view_idx] += int(delta * 1000 + 0.5)
+        self._persist_idb_counters()
+        self._render_status()
+
+    def load_plugin_data(self):
+        self.plugin_sessions = load_session_history(self.plugin_data_path)
+
+    def save_plugin_data(self):
+        try:
+            save_session_history(self.plugin_data_path, self.plugin_sessions)
         except Exception as e:
             print("[time_wasted] Failed saving plugin time data:", e)
 
@@ -535,12 +1813,12 @@ class IDAStatusBarTimerPlugin(idaapi.plugin_t):
             pass
 
         self.load_plugin_config()
+        self._status_format = self._build_status_format()
         if self.config["global"]:
             self.load_plugin_data()
-        self.global_elapsed = sum(session.get("duration_sec", 0) for session in self.plugin_sessions)
-        self.global_debug_elapsed = sum(session.get("debug_duration_sec", 0) for session in self.plugin_sessions)
+        self.global_elapsed = self.plugin_sessions.total_duration()
+        self.global_debug_elapsed = self.plugin_sessions.total_debug_duration()
 
-        self.session_start = time.time()
         main = find_ida_main_window()
         if not main:
             print("[time_wasted] Main window not found.")
@@ -548,91 +1826,22 @@ class IDAStatusBarTimerPlugin(idaapi.plugin_t):
 
         self._main = main
     
-        if self.config["per_idb"]:
-            self.netnode = idaapi.netnode(NETNODE_NAME, 0, 1)
-            self.db_elapsed = self.netnode.altval(NETNODE_DB_TIME_KEY)
-            self.debug_elapsed = self.netnode.altval(NETNODE_DEBUG_TIME_KEY)
+        netnode = idaapi.netnode(NETNODE_NAME, 0, 1) if self.config["per_idb"] else None
+        self._start_idb_session(netnode, idaapi.is_debugger_on())
+        self._start_analysis_tracking()
+        self._install_ida_hooks()
+
+        self.label = _StatusText()
+        self.label.setTooltipProvider(self._status_tooltip)
 
-        self.db_elapsed_start = self.db_elapsed
-        self.debug_elapsed_start = self.debug_elapsed
-    
-        self.label = QLabel()
-        self.last_check = time.time()
-        self.debugging = idaapi.is_debugger_on()
-    
-        def update_label():
-            now = time.time()
-            delta = now - self.last_check
-            self.last_check = now
-    
-            currently_debugging = idaapi.is_debugger_on()
-    
-            if currently_debugging:
-                if not self.debugging:
-                    self.debugging = True
-                self.debug_elapsed += delta
-                if not self.config["stop_re_count_when_debugging"]:
-                    self.db_elapsed += delta
-            else:
-                if self.debugging:
-                    self.debugging = False
-                self.db_elapsed += delta
-                
-    
-            if self.config["per_idb"]:
-                self.netnode.altset(NETNODE_DB_TIME_KEY, int(self.db_elapsed))
-                self.netnode.altset(NETNODE_DEBUG_TIME_KEY, int(self.debug_elapsed))
-    
-            session_reverse = self.db_elapsed - self.db_elapsed_start
-            session_debug = self.debug_elapsed - self.debug_elapsed_start
-            total_global = self.global_elapsed + int(time.time() - self.session_start)
-            total_global_debug = self.global_debug_elapsed + int(session_debug)
-    
-            text = "Time wasted reversing"
-            if self.config["global"]:
-                text += f": {format_elapsed(total_global)}"
-                if self.config["global_debug"]:
-                    text += f" | debugging: {format_elapsed(total_global_debug)}"
-            
-            if self.config["per_idb"]:
-                if self.config["global"]:
-                    text += " ["
-                else:
-                    text += " "
-                text += f"this idb: {format_elapsed(int(self.db_elapsed))}"
-                if self.config["per_idb_debug"]:
-                    text += " | "
-                    if not (self.config["global"] and self.config["global_debug"]):
-                        text += "debugging: "
-                    text += f"{format_elapsed(int(self.debug_elapsed))}"
-                if self.config["global"]:
-                    text += "]"
-            
-            if self.config["per_session"]:
-                if self.config["global"] or self.config["per_idb"]:
-                    text += " ["
-                text += f"this session: {format_elapsed(int(session_reverse))}"
-                if self.config["per_session_debug"]:
-                    text += " | "
-                    if not (self.config["global"] and self.config["global_debug"]) and not (self.config["per_idb"] and self.config["per_idb_debug"]):
-                        text += "debugging: "
-                    text += f"{format_elapsed(int(session_debug))}"
-                if self.config["global"] or self.config["per_idb"]:
-                    text += " ]" 
-                    
-            if self._use_overlay and self.status_container:
-                self._sb_full_text = text
-                try:
-                    self._overlay_relayout()
-                except Exception:
-                    pass
-            else:
-                self.label.setText(text)
-    
         self.timer = QTimer()
-        self.timer.timeout.connect(update_label)
+        self.timer.timeout.connect(self._on_timer)
         self.timer.start(1000)
-        update_label()
+        self._on_timer()
+
+        self._config_timer = QTimer()
+        self._config_timer.timeout.connect(self._check_config)
+        self._config_timer.start(CONFIG_POLL_INTERVAL_MS)
 
         try:
             if ida_version_at_least(9, 3):
@@ -661,8 +1870,6 @@ class IDAStatusBarTimerPlugin(idaapi.plugin_t):
                 # Keep the gap between the overlay strip and the normal statusbar row tight.
                 # Size the reserved top strip based on the label's actual font height.
                 try:
-                    self.label.setWordWrap(False)
-                    self.label.setAlignment(Qt.AlignRight | Qt.AlignTop)
                     self.label.setContentsMargins(0, 0, 0, 0)
                 except Exception:
                     pass
@@ -672,7 +1879,6 @@ class IDAStatusBarTimerPlugin(idaapi.plugin_t):
                     label_h = int(fm.height() or 16)
                 except Exception:
                     try:
-                        self.label.adjustSize()
                         label_h = int(self.label.sizeHint().height() or self.label.height() or 16)
                     except Exception:
                         label_h = 16
@@ -761,18 +1967,9 @@ class IDAStatusBarTimerPlugin(idaapi.plugin_t):
 
     
     def term(self):
-        if self.config["global"]:
-            session_end = time.time()
-            self.plugin_sessions.append({
-                "start": self.session_start,
-                "end": session_end,
-                "duration_sec": int(session_end - self.session_start),
-                "debug_duration_sec": int(self.debug_elapsed - self.debug_elapsed_start)
-            })
-            self.save_plugin_data()
-
+        self._unhook_ida()
         self._teardown_ui()
 
-        if self.netnode and self.config["per_idb"]:
-            self.netnode.altset(NETNODE_DB_TIME_KEY, int(self.db_elapsed))
-            self.netnode.altset(NETNODE_DEBUG_TIME_KEY, int(self.debug_elapsed))
+        self._end_idb_session()
+        if self.config["global"]:
+            self.save_plugin_data()